@@ -1,35 +1,52 @@
+import io
 import streamlit as st
 from docx import Document
 import re
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Roster line: Full Name (ABC) followed by duties
+_ROSTER_LINE_RE = re.compile(r"^(.*?)\s+\(([A-Z]{3})\)\s+(.*)$")
+
 # Parse roster from Word document
-def parse_roster_docx(file):
-    doc = Document(file)
-    data = []
+# Cached on the raw upload bytes (bounded; session state holds the current roster)
+@st.cache_data(show_spinner=False, max_entries=16)
+def parse_roster_docx(docx_bytes: bytes):
+    doc = Document(io.BytesIO(docx_bytes))
+    records = []
 
+    # One match per paragraph (a manual line break inside a paragraph is just whitespace)
     for para in doc.paragraphs:
         line = para.text.strip()
         if not line:
             continue
 
-        # Match: Full Name (ABC) followed by duties
-        m = re.match(r"^(.*?)\s+\(([A-Z]{3})\)\s+(.*)$", line)
-        if not m:
-            continue
+        m = _ROSTER_LINE_RE.match(line)
+        if m:
+            records.append((m.group(1).strip(), m.group(2), m.group(3).split()))
+
+    return pd.DataFrame.from_records(records, columns=["Full Name", "Pilot", "Duties"])
+
 
-        full_name = m.group(1).strip()
-        pilot_code = m.group(2).strip()
-        duties = m.group(3).split()
+# Pad each pilot's duties to max_days so a single day is one column of the array
+def duties_matrix(duties, max_days):
+    arr = np.full((len(duties), max_days), None, dtype=object)
+    for i, d in enumerate(duties):
+        arr[i, :len(d)] = d
+    return arr
 
-        data.append({
-            "Full Name": full_name,
-            "Pilot": pilot_code,
-            "Duties": duties
-        })
 
-    return pd.DataFrame(data)
+# Parsed roster for an upload, kept in session state so a day change only reruns
+# the selection (getvalue() also leaves the upload's read pointer untouched)
+def load_roster(uploaded_file):
+    key = (uploaded_file.file_id, uploaded_file.name, uploaded_file.size)
+    if st.session_state.get("roster_key") != key:
+        df = parse_roster_docx(uploaded_file.getvalue())
+        max_days = int(df["Duties"].map(len).max()) if not df.empty else 0
+        st.session_state["roster_key"] = key
+        st.session_state["roster"] = (df, duties_matrix(df["Duties"], max_days))
+    return st.session_state["roster"]
 
 
 # Streamlit app
@@ -38,17 +55,17 @@ st.title("Crew A-Day Tracker (DOCX Version)")
 uploaded_file = st.file_uploader("Upload a roster (.docx)", type=["docx"])
 
 if uploaded_file:
-    df = parse_roster_docx(uploaded_file)
+    df, duties_arr = load_roster(uploaded_file)
 
     if not df.empty:
         st.success("Roster parsed successfully!")
 
-        # Figure out how many days are in schedule (based on longest duties list)
-        max_days = df["Duties"].map(len).max()
+        # Days in schedule = longest duties list = width of the padded array
+        max_days = duties_arr.shape[1]
         selected_day = st.number_input("Select a day", min_value=1, max_value=max_days, value=1)
 
         # Find A-day pilots
-        a_day_pilots = df[df["Duties"].map(lambda d: d[selected_day-1] if selected_day-1 < len(d) else None) == "A"]
+        a_day_pilots = df.loc[duties_arr[:, selected_day-1] == "A"]
 
         st.subheader(f"Pilots on A day {selected_day}")
         if not a_day_pilots.empty: